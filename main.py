@@ -5,33 +5,65 @@ KanDownloader – CLI tool to download episodes from kan.org.il.
 from __future__ import annotations
 
 import argparse
+import functools
+import hashlib
+import json
 import logging
+import math
 import os
 import re
 import shutil
 import subprocess
 import sys
+import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from html import unescape
 from typing import Optional
 from urllib.parse import urljoin, urlparse
 
 from bs4 import BeautifulSoup
-from curl_cffi import requests
+from curl_cffi import CurlHttpVersion, CurlOpt, requests
 
 LOG_FILE = "KanVideoDownloader.log"
 LOG_FORMAT = "%(asctime)s  %(levelname)-8s  %(message)s"
 DEFAULT_OUTPUT_DIR = "episodes"
 PROGRESS_BAR_WIDTH = 30
+PROGRESS_READ_SIZE = 4096
+# Bytes of progress output kept between reads; ffmpeg emits one
+# out_time_us= sample per ~250-byte block.
+PROGRESS_TAIL = 1024
 HTTP_TIMEOUT = 30
+# curl error codes for a dropped connection: (18) partial file, (55) send failure
+RECONNECT_CURL_CODES = (18, 55)
+DEFAULT_JOBS = 3
+STATUS_INTERVAL = 0.25
+PROBE_CACHE_DIR = ".kan_cache"
+HTTP_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "KanVideoDownloader")
+STREAM_CHUNK_SIZE = 65536
+# Tail kept between chunks so a "contentUrl" key or "http" split across
+# chunks is still seen.
+STREAM_OVERLAP = 16
 
 M3U8_PATTERNS: list[str] = [
     r'"contentUrl"\s*:\s*"([^"]+\.m3u8[^"]*)"',
     r'https?://[^\s"\'<>]+\.m3u8[^\s"\'<>]*',
 ]
 
+M3U8_RE = re.compile("|".join(f"(?:{p})" for p in M3U8_PATTERNS))
+M3U8_BYTES_RE = re.compile(M3U8_RE.pattern.encode())
+URL_END_BYTES_RE = re.compile(rb"[\s\"'<>]")
+EXTINF_RE = re.compile(r"#EXTINF:\s*([\d.]+)")
+MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+BANDWIDTH_RE = re.compile(r"[:,]BANDWIDTH=(\d+)")
 TRAILER_RE = re.compile(r"טריילר|trailer", re.IGNORECASE)
+OG_TITLE_RE = re.compile(
+    r"""<meta\s(?:[^>]*?\s)?property=["']og:title["'][^>]*?\scontent=(?:"([^"]*)"|'([^']*)')"""
+    r"""|<meta\s(?:[^>]*?\s)?content=(?:"([^"]*)"|'([^']*)')[^>]*?\sproperty=["']og:title["']""",
+    re.IGNORECASE,
+)
 PROGRAM_ID_RE = re.compile(r"/(p-\d+)/")
-UNSAFE_CHARS_RE = re.compile(r'[\\/*?:"<>|]')
+SANITIZE_TABLE = str.maketrans(dict.fromkeys('\\/*?:"<>|', "_"))
 
 PROJECT_FFMPEG = os.path.join(
     os.path.dirname(os.path.abspath(__file__)),
@@ -46,7 +78,19 @@ logger.setLevel(logging.DEBUG)
 
 _formatter = logging.Formatter(LOG_FORMAT)
 
-_console = logging.StreamHandler()
+
+
+class _ConsoleHandler(logging.StreamHandler):
+    """Console handler that keeps the download status line below log output."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        with _print_lock:
+            _clear_status()
+            super().emit(record)
+            _draw_status()
+
+
+_console = _ConsoleHandler()
 _console.setFormatter(_formatter)
 logger.addHandler(_console)
 
@@ -54,7 +98,31 @@ _logfile = logging.FileHandler(LOG_FILE, "a", "utf-8")
 _logfile.setFormatter(_formatter)
 logger.addHandler(_logfile)
 
-_session = requests.Session(impersonate="chrome")
+
+def _new_session(cdn: bool = False) -> requests.Session:
+    """Create an HTTP/2 keep-alive session.
+
+    The Chrome fingerprint is only needed for kan.org.il pages; ``cdn`` sessions
+    used for m3u8 manifests skip impersonation.
+    """
+    return requests.Session(
+        impersonate=None if cdn else "chrome",
+        http_version=CurlHttpVersion.V2TLS,
+        curl_options={CurlOpt.TCP_KEEPALIVE: 1},
+    )
+
+
+_session = _new_session()
+_cdn_session = _new_session(cdn=True)
+_session_lock = threading.Lock()
+_print_lock = threading.Lock()
+# Progress of labelled (pooled) downloads as (full, short) text. Workers only
+# update it; the main thread draws it as a single status line.
+_status: dict[str, tuple[str, str]] = {}
+_status_width = 0
+_procs: set[subprocess.Popen] = set()
+_procs_lock = threading.Lock()
+_cancel = threading.Event()
 
 
 def _parse_args() -> argparse.Namespace:
@@ -76,6 +144,28 @@ def _parse_args() -> argparse.Namespace:
     p.add_argument(
         "-fp", "--ffmpeg-path", default=None, help="Explicit path to the ffmpeg binary"
     )
+    p.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=DEFAULT_JOBS,
+        help=f"Number of episodes to download in parallel (default: {DEFAULT_JOBS})",
+    )
+    p.add_argument(
+        "--no-probe-cache",
+        action="store_true",
+        help=f"Do not read or write cached stream durations in {PROBE_CACHE_DIR}/",
+    )
+    p.add_argument(
+        "--no-http-cache",
+        action="store_true",
+        help=f"Do not read or write cached pages in {HTTP_CACHE_DIR}",
+    )
+    p.add_argument(
+        "--force",
+        action="store_true",
+        help="Download episodes even if the output file already exists",
+    )
     return p.parse_args()
 
 
@@ -88,17 +178,11 @@ def _resolve_ffmpeg(explicit: Optional[str]) -> str:
             sys.exit(1)
         return explicit
 
-    try:
-        subprocess.run(
-            ["ffmpeg", "-version"],
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-            check=True,
-        )
-        logger.info("ffmpeg found in system PATH")
+    path = shutil.which("ffmpeg")
+    if path:
+        logger.info("ffmpeg found in system PATH: %s", path)
         return "ffmpeg"
-    except FileNotFoundError:
-        logger.warning("ffmpeg not in system PATH")
+    logger.warning("ffmpeg not in system PATH")
 
     if os.path.isfile(PROJECT_FFMPEG):
         logger.info("Using bundled ffmpeg: %s", PROJECT_FFMPEG)
@@ -120,42 +204,281 @@ def _resolve_ffprobe(ffmpeg_bin: str) -> Optional[str]:
     return path if os.path.isfile(path) else None
 
 
-def _fetch(url: str, timeout: int = HTTP_TIMEOUT) -> str:
-    """Fetch the page content."""
+def _get(url: str, cdn: bool = False, **kwargs) -> requests.Response:
+    """GET through a shared session, reconnecting once if the connection dropped."""
+    global _session, _cdn_session
+    session = _cdn_session if cdn else _session
+    try:
+        return session.get(url, **kwargs)
+    except requests.RequestsError as exc:
+        if getattr(exc, "code", None) not in RECONNECT_CURL_CODES:
+            raise
+        logger.debug("Connection dropped (%s), reconnecting", exc)
+        with _session_lock:
+            if cdn:
+                if _cdn_session is session:
+                    _cdn_session = _new_session(cdn=True)
+                session = _cdn_session
+            else:
+                if _session is session:
+                    _session = _new_session()
+                session = _session
+        return session.get(url, **kwargs)
+
+
+def _cache_path(cache_dir: str, key: str) -> str:
+    """Return the cache file path for the given key."""
+    return os.path.join(cache_dir, hashlib.sha1(key.encode()).hexdigest() + ".json")
+
+
+def _read_cache(path: str) -> Optional[dict]:
+    """Load a JSON cache entry, returning None if missing or unreadable."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _write_cache(path: str, data: dict) -> None:
+    """Atomically write a JSON cache entry."""
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+    except OSError as exc:
+        logger.debug("Cache write failed for %s: %s", path, exc)
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+
+def _max_age(cache_control: Optional[str]) -> Optional[int]:
+    """Return the max-age in seconds, or None if the response must not be stored."""
+    cc = (cache_control or "").lower()
+    if "no-store" in cc:
+        return None
+    if "no-cache" in cc:
+        return 0
+    m = MAX_AGE_RE.search(cc)
+    return int(m.group(1)) if m else 0
+
+
+def _http_cache_entry(
+    cache_dir: Optional[str], url: str
+) -> tuple[Optional[str], Optional[dict]]:
+    """Return the HTTP cache path and stored entry for ``url``, if caching is on."""
+    if not cache_dir:
+        return None, None
+    path = _cache_path(cache_dir, url)
+    cached = _read_cache(path)
+    if cached and not isinstance(cached.get("body"), str):
+        cached = None
+    return path, cached
+
+
+def _is_fresh(cached: dict) -> bool:
+    """Whether a stored page is still within its max-age."""
+    return time.time() - cached.get("ts", 0) < cached.get("max_age", 0)
+
+
+def _conditional_headers(cached: Optional[dict]) -> Optional[dict]:
+    """Build If-None-Match / If-Modified-Since headers for a stored page."""
+    headers = {}
+    if cached and cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+    if cached and cached.get("last_modified"):
+        headers["If-Modified-Since"] = cached["last_modified"]
+    return headers or None
+
+
+def _revalidated(path: str, cached: dict, r: requests.Response) -> str:
+    """Refresh a stored page after a 304 and return its body."""
+    logger.debug("Not modified: %s", r.url)
+    max_age = _max_age(r.headers.get("Cache-Control"))
+    if max_age is not None:
+        cached.update(ts=time.time(), max_age=max_age)
+        _write_cache(path, cached)
+    return cached["body"]
+
+
+def _cacheable(r: requests.Response) -> bool:
+    """Whether a 200 response carries enough headers to be stored."""
+    max_age = _max_age(r.headers.get("Cache-Control"))
+    return max_age is not None and bool(
+        max_age or r.headers.get("ETag") or r.headers.get("Last-Modified")
+    )
+
+
+def _store_page(path: str, r: requests.Response, text: str) -> None:
+    """Store a 200 response body with its validators."""
+    _write_cache(
+        path,
+        {
+            "body": text,
+            "etag": r.headers.get("ETag"),
+            "last_modified": r.headers.get("Last-Modified"),
+            "max_age": _max_age(r.headers.get("Cache-Control")),
+            "ts": time.time(),
+        },
+    )
+
+
+def _fetch(
+    url: str, timeout: int = HTTP_TIMEOUT, http_cache_dir: Optional[str] = None
+) -> str:
+    """Fetch the page content, revalidating against the on-disk HTTP cache."""
+    path, cached = _http_cache_entry(http_cache_dir, url)
+    if cached and _is_fresh(cached):
+        logger.info("GET %s (cached)", url)
+        return cached["body"]
+
     logger.info("GET %s", url)
-    r = _session.get(url, timeout=timeout)
+    r = _get(url, timeout=timeout, headers=_conditional_headers(cached))
+    if cached and r.status_code == 304:
+        return _revalidated(path, cached, r)  # type: ignore[arg-type]
     r.raise_for_status()
     logger.debug("Res headers: %s (%dbytes)", r.headers, len(r.content))
-    return r.text
+    text = r.text
+    if path and _cacheable(r):
+        _store_page(path, r, text)
+    return text
+
+
+def _parse(html: str) -> BeautifulSoup:
+    """Parse page HTML into a BeautifulSoup tree."""
+    return BeautifulSoup(html, "lxml")
 
 
 def _sanitize(name: str) -> str:
     """Make a string safe for use as a filename."""
-    return UNSAFE_CHARS_RE.sub("_", name).strip()
+    return name.translate(SANITIZE_TABLE).strip()
 
 
 def _extract_m3u8(html: str) -> Optional[str]:
-    """Extract the m3u8 URL from the page HTML using regex patterns."""
+    """Extract the m3u8 URL from the page HTML using regex patterns.
+
+    A ``"contentUrl"`` match anywhere on the page wins over bare m3u8 URLs,
+    which may point at previews or trailers.
+    """
     logger.info("Searching for m3u8 URL...")
-    for pat in M3U8_PATTERNS:
-        m = re.search(pat, html)
-        if m:
-            url = m.group(1) if m.lastindex else m.group(0)
-            logger.info("Found m3u8: %s", url)
-            return url
+    url = None
+    # Every pattern contains ".m3u8"; skip the regex scan on pages without it.
+    if ".m3u8" in html:
+        for m in M3U8_RE.finditer(html):
+            if m.group(1):
+                url = m.group(1)
+                break
+            if url is None:
+                url = m.group(0)
+    if url:
+        logger.info("Found m3u8: %s", url)
+        return url
     logger.warning("m3u8 URL not found")
     return None
 
 
-def _extract_episode_links(html: str, page_url: str) -> list[dict]:
-    """Extract episode links and titles from a show page."""
+def _stream_keep(buf: bytearray) -> int:
+    """Return the offset from which ``buf`` must be kept for the next chunk.
+
+    Keeps the last ``"contentUrl"`` whose value is not closed yet and the last
+    ``http`` URL that is still running, however long they are.
+    """
+    keep = len(buf) - STREAM_OVERLAP
+    c = buf.rfind(b'"contentUrl"')
+    # Key quotes excluded, the value still needs its opening and closing quote.
+    if c >= 0 and buf.count(b'"', c + 12) < 2:
+        keep = min(keep, c)
+    h = buf.rfind(b"http")
+    if h >= 0 and not URL_END_BYTES_RE.search(buf, h):
+        keep = min(keep, h)
+    return max(keep, 0)
+
+
+def _stream_m3u8(
+    url: str, timeout: int = HTTP_TIMEOUT, http_cache_dir: Optional[str] = None
+) -> Optional[str]:
+    """Stream the page and return its m3u8 URL.
+
+    Reading stops at the first ``"contentUrl"`` match; otherwise the first bare
+    m3u8 URL is used once the whole page has been read, as in ``_extract_m3u8``.
+    Pages go through the same HTTP cache as ``_fetch``: a stored copy is reused
+    or revalidated, and cacheable responses are read in full so they can be stored.
+    """
+    path, cached = _http_cache_entry(http_cache_dir, url)
+    if cached and _is_fresh(cached):
+        logger.info("GET %s (cached)", url)
+        return _extract_m3u8(cached["body"])
+
+    logger.info("GET %s (streaming)", url)
+    r = _get(url, timeout=timeout, stream=True, headers=_conditional_headers(cached))
+    found: Optional[bytes] = None
+    bare: Optional[bytes] = None
+    body: Optional[bytearray] = None
+    try:
+        if cached and r.status_code == 304:
+            return _extract_m3u8(_revalidated(path, cached, r))  # type: ignore[arg-type]
+        r.raise_for_status()
+        logger.info("Searching for m3u8 URL...")
+        if path and _cacheable(r):
+            body = bytearray()
+        buf = bytearray()
+        for chunk in r.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+            if body is not None:
+                body += chunk
+                if found:
+                    continue
+            buf += chunk
+            if b".m3u8" in buf:
+                for m in M3U8_BYTES_RE.finditer(buf):
+                    if m.group(1):
+                        found = m.group(1)
+                        break
+                    # A bare URL reaching the end of the buffer may be cut short;
+                    # it is matched again once the next chunk arrives.
+                    if bare is None and m.end() < len(buf):
+                        bare = m.group(0)
+                if found and body is None:
+                    break
+            del buf[: _stream_keep(buf)]
+        else:
+            if body is not None:
+                _store_page(path, r, body.decode("utf-8", "replace"))  # type: ignore[arg-type]
+            if not found and bare is None and b".m3u8" in buf:
+                m = M3U8_BYTES_RE.search(buf)
+                bare = m.group(0) if m else None
+    finally:
+        r.close()
+    match = found or bare
+    if match:
+        url = match.decode("utf-8", "replace")
+        logger.info("Found m3u8: %s", url)
+        return url
+    logger.warning("m3u8 URL not found")
+    return None
+
+
+def _extract_title(html: str, page_url: str) -> str:
+    """Read the og:title of a page, falling back to the last URL path segment."""
+    m = OG_TITLE_RE.search(html)
+    og_title = next((g for g in m.groups() if g is not None), None) if m else None
+    if og_title and og_title.strip():
+        return unescape(og_title).strip()
+    return urlparse(page_url).path.rstrip("/").split("/")[-1]
+
+
+def _extract_episode_links(soup: BeautifulSoup, page_url: str) -> list[dict]:
+    """Extract episode links and titles from a parsed show page."""
     logger.info("Looking for episodes...")
-    soup = BeautifulSoup(html, "html.parser")
-    base = f"{urlparse(page_url).scheme}://{urlparse(page_url).netloc}"
+    parsed = urlparse(page_url)
+    base = f"{parsed.scheme}://{parsed.netloc}"
     pid_match = PROGRAM_ID_RE.search(page_url)
     pid = pid_match.group(1) if pid_match else None
-    seen: set[str] = set()
-    episodes: list[dict] = []
+    episodes: dict[str, dict] = {}
     for a in soup.select("a.card-link[href]"):
         t = a.select_one(".card-title")
         if not t:
@@ -169,42 +492,74 @@ def _extract_episode_links(html: str, page_url: str) -> list[dict]:
         if TRAILER_RE.search(title):
             logger.debug("Skiping trailer: %s", title)
             continue
-        if href in seen:
+        ep = {"title": title, "url": href}
+        if episodes.setdefault(href, ep) is not ep:
             logger.debug("Skiping duplicate link: %s", href)
-            continue
-
-        seen.add(href)
-        episodes.append({"title": title, "url": href})
 
     logger.info("Found %d episode/s for %s", len(episodes), pid)
-    return episodes
-
-
+    return list(episodes.values())
+
+
+def _pick_variant(master: str, m3u8_url: str) -> Optional[str]:
+    """Return the highest-bandwidth variant URL from a master playlist."""
+    best_url: Optional[str] = None
+    best_bw = -1
+    bw = 0
+    for line in master.splitlines():
+        line = line.strip()
+        if line.startswith("#EXT-X-STREAM-INF"):
+            m = BANDWIDTH_RE.search(line)
+            bw = int(m.group(1)) if m else 0
+        elif line and not line.startswith("#"):
+            if bw > best_bw:
+                best_url, best_bw = urljoin(m3u8_url, line), bw
+            bw = 0
+    return best_url
+
+
+@functools.lru_cache(maxsize=256)
 def _m3u8_duration(m3u8_url: str) -> Optional[float]:
     """Parse the m3u8 manifest to estimate total duration."""
     try:
-        text = _session.get(m3u8_url, timeout=15).text
+        text = _get(m3u8_url, cdn=True, timeout=15).text
     except Exception as exc:
         logger.debug("m3u8 fetch failed: %s", exc)
         return None
     if "#EXT-X-STREAM-INF" in text:
-        for line in text.splitlines():
-            line = line.strip()
-            if line and not line.startswith("#"):
-                try:
-                    text = _session.get(urljoin(m3u8_url, line), timeout=15).text
-                except Exception as exc:
-                    logger.debug("Variant fetch failed: %s", exc)
-                    return None
-                break
-    total = sum(float(m.group(1)) for m in re.finditer(r"#EXTINF:\s*([\d.]+)", text))
+        variant_url = _pick_variant(text, m3u8_url)
+        if not variant_url:
+            return None
+        logger.debug("m3u8 variant: %s", variant_url)
+        try:
+            text = _get(variant_url, cdn=True, timeout=15).text
+        except Exception as exc:
+            logger.debug("Variant fetch failed: %s", exc)
+            return None
+    total = math.fsum(map(float, EXTINF_RE.findall(text)))
     if total > 0:
         logger.debug("m3u8 duration: %.2f seconds", total)
         return total
     return None
 
 
-def _get_duration(ffmpeg_bin: str, m3u8_url: str) -> Optional[float]:
+def _get_duration(
+    ffmpeg_bin: str, m3u8_url: str, cache_dir: Optional[str] = None
+) -> Optional[float]:
+    """Get the stream duration, using the on-disk probe cache when enabled."""
+    if not cache_dir:
+        return _probe_duration(ffmpeg_bin, m3u8_url)
+    path = _cache_path(cache_dir, m3u8_url)
+    cached = _read_cache(path)
+    if cached and isinstance(cached.get("duration"), (int, float)):
+        logger.debug("Duration (cache): %.2f seconds", cached["duration"])
+        return float(cached["duration"])
+    duration = _probe_duration(ffmpeg_bin, m3u8_url)
+    if duration:
+        _write_cache(path, {"duration": duration, "ts": time.time()})
+    return duration
+
+
+def _probe_duration(ffmpeg_bin: str, m3u8_url: str) -> Optional[float]:
     """Try to get the total duration of the stream via ffprobe, falling back to m3u8 parsing."""
     probe = _resolve_ffprobe(ffmpeg_bin)
     if probe:
@@ -249,91 +604,207 @@ def _fmt_time(seconds: float) -> str:
     return f"{m:02d}:{seconds:02d}"
 
 
+_BAR_FULL = "█" * PROGRESS_BAR_WIDTH
+_BAR_EMPTY = "░" * PROGRESS_BAR_WIDTH
+
+
 def _bar(
     p_of_prog: float,
     elapsed: float,
     total_duration: Optional[float],
+    total_str: Optional[str] = None,
     w: int = PROGRESS_BAR_WIDTH,
 ) -> str:
+    """Render the progress bar; pass ``total_str`` to reuse a preformatted total."""
     filled = int(w * p_of_prog / 100)
-    bar = f"[{'█' * filled}{'░' * (w - filled)}] {p_of_prog:5.1f}%"
-    elapsed_str = _fmt_time(elapsed)
+    parts = ["[", _BAR_FULL[:filled], _BAR_EMPTY[: w - filled], f"] {p_of_prog:5.1f}%  "]
+    parts.append(_fmt_time(elapsed))
     if total_duration and total_duration > 0 and p_of_prog > 0:
-        total_str = _fmt_time(total_duration)
         remaining = max((total_duration - elapsed), 0)
-        eta_str = _fmt_time(remaining)
-        return f"{bar}  {elapsed_str} / {total_str}  ETA {eta_str}"
-    return f"{bar}  {elapsed_str}"
+        parts += [
+            " / ",
+            total_str or _fmt_time(total_duration),
+            "  ETA ",
+            _fmt_time(remaining),
+        ]
+    return "".join(parts)
+
+
+def _clear_status() -> None:
+    """Blank the status line. The caller must hold ``_print_lock``."""
+    global _status_width
+    if _status_width:
+        print(f"\r{' ' * _status_width}\r", end="", flush=True)
+        _status_width = 0
+
+
+def _draw_status() -> None:
+    """Draw one status line for all running jobs. The caller must hold ``_print_lock``."""
+    global _status_width
+    if not _status:
+        return
+    if len(_status) == 1:
+        ((label, (full, _)),) = _status.items()
+        line = f"{label} {full.lstrip()}"
+    else:
+        line = "  ".join(f"{label} {short}" for label, (_, short) in _status.items())
+    line = line[: shutil.get_terminal_size().columns - 1]
+    pad = " " * max(_status_width - len(line), 0)
+    print(f"\r{line}{pad}", end="", flush=True)
+    _status_width = len(line)
 
 
-def _download(ffmpeg_bin: str, m3u8_url: str, dest: str) -> None:
+def _render_status() -> None:
+    """Redraw the status line; called periodically from the main thread."""
+    with _print_lock:
+        _draw_status()
+
+
+def _progress(label: str, full: str, short: str) -> None:
+    """Report download progress; unlabelled downloads draw their own line."""
+    with _print_lock:
+        if label:
+            _status[label] = (full, short)
+        else:
+            print(f"\r{full}", end="", flush=True)
+
+
+def _progress_done(label: str, line: str) -> None:
+    """End a download's progress output, printing ``line`` if given."""
+    with _print_lock:
+        if not label:
+            print(f"\r{line}", flush=True)
+            return
+        _status.pop(label, None)
+        _clear_status()
+        if line:
+            print(f"{label} {line}", flush=True)
+        _draw_status()
+
+
+def _kill_downloads() -> None:
+    """Stop all running ffmpeg processes and keep new ones from starting."""
+    with _procs_lock:
+        _cancel.set()
+        for proc in _procs:
+            proc.kill()
+    with _print_lock:
+        _status.clear()
+        _clear_status()
+
+
+def _download(
+    ffmpeg_bin: str,
+    m3u8_url: str,
+    dest: str,
+    label: str = "",
+    cache_dir: Optional[str] = None,
+) -> None:
     """Download the stream using ffmpeg"""
     logger.info("Downloading to %s", dest)
-    duration = _get_duration(ffmpeg_bin, m3u8_url)
+    # Write to a separate file so an interrupted download is never mistaken
+    # for a finished one.
+    root, ext = os.path.splitext(dest)
+    part = f"{root}.part{ext}"
+    duration = _get_duration(ffmpeg_bin, m3u8_url, cache_dir)
     cmd = [
         ffmpeg_bin,
+        "-hide_banner",
+        "-nostdin",
         "-y",
         "-loglevel",
         "error",
         "-progress",
         "pipe:1",
+        # Reuse connections across segments and reconnect on drops.
+        "-http_persistent",
+        "1",
+        "-http_multiple",
+        "1",
+        "-multiple_requests",
+        "1",
+        "-reconnect",
+        "1",
+        "-reconnect_streamed",
+        "1",
+        "-reconnect_delay_max",
+        "5",
         "-i",
         m3u8_url,
         "-c",
         "copy",
         "-bsf:a",
         "aac_adtstoasc",
-        dest,
+        part,
     ]
     proc = subprocess.Popen(
         cmd,
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
-        text=True,
-        encoding="utf-8",
-        errors="replace",
+        bufsize=65536,
     )
+    with _procs_lock:
+        _procs.add(proc)
+        if _cancel.is_set():
+            proc.kill()
     last_t = 0.0
     start = time.monotonic()
+    # Redraw interval; only the latest sample is parsed on each redraw.
+    interval = 0.25 if duration and duration > 0 else 1.0
+    total_str = _fmt_time(duration) if duration else None
+    read = functools.partial(proc.stdout.read1, PROGRESS_READ_SIZE)  # type: ignore[union-attr]
+    tail = b""
     try:
-        for line in proc.stdout:  # type: ignore[union-attr]
-            if not line.startswith("out_time_us="):
-                continue
-            try:
-                elapsed = int(line.split("=", 1)[1]) / 1_000_000
-            except ValueError:
-                continue
-
+        for chunk in iter(read, b""):
+            data = tail + chunk
+            tail = data[-PROGRESS_TAIL:]
             now = time.monotonic()
-            wall = now - start
+            if now - last_t < interval:
+                continue
             if duration and duration > 0:
+                # Last out_time_us= whose line is already complete.
+                i = data.rfind(b"out_time_us=", 0, data.rfind(b"\n"))
+                if i < 0:
+                    continue
+                try:
+                    elapsed = int(data[i + 12 : data.index(b"\n", i)]) / 1_000_000
+                except ValueError:
+                    continue
                 p_of_prog = min(elapsed / duration * 100, 100.0)
-                if now - last_t >= 0.25 or p_of_prog >= 100:
-                    print(
-                        f"\r  {_bar(p_of_prog, elapsed, duration)}", end="", flush=True
-                    )
-                    last_t = now
-            elif now - last_t >= 1.0:
-                m, s = divmod(int(wall), 60)
-                print(f"\rDownloading… {m:02d}:{s:02d} elapsed", end="", flush=True)
-                last_t = now
+                bar = _bar(p_of_prog, elapsed, duration, total_str)
+                _progress(label, f"  {bar}", f"{p_of_prog:5.1f}%")
+            else:
+                m, s = divmod(int(now - start), 60)
+                _progress(
+                    label,
+                    f"Downloading… {m:02d}:{s:02d} elapsed",
+                    f"{m:02d}:{s:02d}",
+                )
+            last_t = now
         proc.wait()
         if proc.returncode != 0:
-            err = proc.stderr.read() if proc.stderr else ""
-            print()
-            logger.error("ffmpeg: %s", err.strip())
+            err = proc.stderr.read().decode("utf-8", "replace") if proc.stderr else ""
+            _progress_done(label, "")
+            if not _cancel.is_set():
+                logger.error("ffmpeg: %s", err.strip())
             raise subprocess.CalledProcessError(proc.returncode, cmd)
         wall = time.monotonic() - start
         if duration:
-            print(f"\r{_bar(100.0, duration, duration)}")
+            _progress_done(label, _bar(100.0, duration, duration, total_str))
         else:
             m, s = divmod(int(wall), 60)
-            print(f"\rDone in {m:02d}:{s:02d}")
+            _progress_done(label, f"Done in {m:02d}:{s:02d}")
     except Exception:
         proc.kill()
         proc.wait()
         raise
+    finally:
+        with _procs_lock:
+            _procs.discard(proc)
+        with _print_lock:
+            _status.pop(label, None)
 
+    os.replace(part, dest)
     logger.info("Saved %s", dest)
 
 
@@ -389,23 +860,52 @@ def _choose_episodes(episodes: list[dict]) -> list[dict]:
 
 
 def _process_episode(
-    url: str, ffmpeg_bin: str, out_dir: str, title: Optional[str] = None
+    url: str,
+    ffmpeg_bin: str,
+    out_dir: str,
+    title: Optional[str] = None,
+    label: str = "",
+    cache_dir: Optional[str] = None,
+    html: Optional[str] = None,
+    force: bool = False,
+    http_cache_dir: Optional[str] = None,
 ) -> None:
-    """Fetch a single episode page, find its m3u8, and download it."""
-    html = _fetch(url)
-    m3u8 = _extract_m3u8(html)
+    """Fetch a single episode page, find its m3u8, and download it.
+
+    ``html`` may be passed when the page was already fetched.
+    Episodes whose output file already exists are skipped unless ``force`` is set.
+    """
+    if _cancel.is_set():
+        return
+    if label:
+        logger.info("%s %s", label, title or url)
+    if title and not force:
+        dest = os.path.join(out_dir, f"{_sanitize(title)}.mp4")
+        if os.path.exists(dest):
+            logger.info("Skipping existing %s", dest)
+            return
+    if html is None and title:
+        m3u8 = _stream_m3u8(url, http_cache_dir=http_cache_dir)
+    else:
+        if html is None:
+            html = _fetch(url, http_cache_dir=http_cache_dir)
+        m3u8 = _extract_m3u8(html)
     if not m3u8:
         logger.error("Skipping (no m3u8): %s", url)
         return
     if not title:
-        soup = BeautifulSoup(html, "html.parser")
-        og = soup.find("meta", property="og:title")
-        title = og["content"] if og else urlparse(url).path.rstrip("/").split("/")[-1]
+        title = _extract_title(html, url)  # type: ignore[arg-type]
     dest = os.path.join(out_dir, f"{_sanitize(title)}.mp4")
+    if not force and os.path.exists(dest):
+        logger.info("Skipping existing %s", dest)
+        return
     try:
-        _download(ffmpeg_bin, m3u8, dest)
+        _download(ffmpeg_bin, m3u8, dest, label=label, cache_dir=cache_dir)
     except subprocess.CalledProcessError as exc:
-        logger.error("ffmpeg failed for %s: %s", title, exc)
+        if _cancel.is_set():
+            logger.info("Stopped %s", title)
+        else:
+            logger.error("ffmpeg failed for %s: %s", title, exc)
 
 
 def main() -> None:
@@ -415,19 +915,62 @@ def main() -> None:
     ffmpeg = _resolve_ffmpeg(args.ffmpeg_path)
     out_dir: str = args.output
     os.makedirs(out_dir, exist_ok=True)
+    cache_dir = None if args.no_probe_cache else os.path.join(out_dir, PROBE_CACHE_DIR)
+    http_cache_dir = None if args.no_http_cache else HTTP_CACHE_DIR
 
-    html = _fetch(args.url)
-    episodes = _extract_episode_links(html, args.url)
+    html = _fetch(args.url, http_cache_dir=http_cache_dir)
+    soup = _parse(html)
+    episodes = _extract_episode_links(soup, args.url)
 
     if episodes:
         chosen = _choose_episodes(episodes)
-        logger.info("Downloading %d episode/s", len(chosen))
+        jobs = max(1, min(args.jobs, len(chosen)))
+        logger.info("Downloading %d episode/s (%d in parallel)", len(chosen), jobs)
+        ex = ThreadPoolExecutor(max_workers=jobs)
+        futures = {}
         for i, ep in enumerate(chosen, 1):
-            logger.info("[%d/%d] %s", i, len(chosen), ep["title"])
-            _process_episode(ep["url"], ffmpeg, out_dir, title=ep["title"])
+            fut = ex.submit(
+                _process_episode,
+                ep["url"],
+                ffmpeg,
+                out_dir,
+                title=ep["title"],
+                label=f"[{i}/{len(chosen)}]",
+                cache_dir=cache_dir,
+                force=args.force,
+                http_cache_dir=http_cache_dir,
+            )
+            futures[fut] = ep
+        try:
+            pending = set(futures)
+            while pending:
+                done, pending = wait(
+                    pending, timeout=STATUS_INTERVAL, return_when=FIRST_COMPLETED
+                )
+                for fut in done:
+                    try:
+                        fut.result()
+                    except Exception as exc:
+                        logger.error("Failed %s: %s", futures[fut]["title"], exc)
+                _render_status()
+        except KeyboardInterrupt:
+            ex.shutdown(wait=False, cancel_futures=True)
+            _kill_downloads()
+            logger.info("Cancelled, waiting for running downloads to stop...")
+            ex.shutdown(wait=True)
+            raise
+        ex.shutdown()
     else:
         logger.info("Single episode, downloading...")
-        _process_episode(args.url, ffmpeg, out_dir)
+        _process_episode(
+            args.url,
+            ffmpeg,
+            out_dir,
+            cache_dir=cache_dir,
+            html=html,
+            force=args.force,
+            http_cache_dir=http_cache_dir,
+        )
     logger.info("Done.")
 
 
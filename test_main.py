@@ -0,0 +1,65 @@
+import pytest
+
+pytest.importorskip("bs4")
+pytest.importorskip("curl_cffi")
+
+import main  # noqa: E402
+
+URL = "https://www.kan.org.il/content/kan/kan-11/p-829567/s1/840305/"
+
+
+@pytest.mark.parametrize(
+    "html, expected",
+    [
+        ('<meta property="og:title" content="Tom &amp; Jerry\'s">', "Tom & Jerry's"),
+        ("<META content='Reversed' property=\"og:title\"/>", "Reversed"),
+        (
+            '<meta content="width=device-width" name="viewport">'
+            '<meta data-rh="true" property="og:title" content="Real Title">',
+            "Real Title",
+        ),
+        ('<meta property="og:title" data-content="bad" content="Good">', "Good"),
+        ('<meta data-content="bad" content="Good" property="og:title">', "Good"),
+        ('<meta data-property="og:title" content="bad">', "840305"),
+        ('<meta content="x" name="viewport"><title>No og</title>', "840305"),
+    ],
+)
+def test_extract_title(html, expected):
+    assert main._extract_title(html, URL) == expected
+
+
+def test_extract_m3u8_prefers_content_url():
+    html = (
+        "<p>https://cdn/x/preview.m3u8</p>"
+        '<script>{"contentUrl": "https://cdn/main.m3u8?t=1"}</script>'
+    )
+    assert main._extract_m3u8(html) == "https://cdn/main.m3u8?t=1"
+
+
+def test_extract_m3u8_falls_back_to_first_bare_url():
+    html = "a https://cdn/a.m3u8?x=1 b https://cdn/b.m3u8"
+    assert main._extract_m3u8(html) == "https://cdn/a.m3u8?x=1"
+
+
+class _FakeStream:
+    def __init__(self, body: bytes, chunk: int):
+        self.body = body
+        self.chunk = chunk
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size=None):
+        for i in range(0, len(self.body), self.chunk):
+            yield self.body[i : i + self.chunk]
+
+    def close(self):
+        pass
+
+
+@pytest.mark.parametrize("chunk", [7, 512, 65536])
+def test_stream_m3u8_keeps_long_content_url(monkeypatch, chunk):
+    m3u8 = "https://cdn/main.m3u8?token=" + "a" * 600
+    body = ("x" * 70000 + '{"contentUrl": "%s"}' % m3u8).encode()
+    monkeypatch.setattr(main, "_get", lambda url, **kw: _FakeStream(body, chunk))
+    assert main._stream_m3u8("https://www.kan.org.il/ep/") == m3u8